@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+#==========================================================
+#
+#  Micro-benchmark for RCloneSync.diffLists on synthetic prior/current listings
+#
+#  Usage
+#   python benchmark/bench_diffLists.py [--Entries N] [--Changes PCT] [--Seed S]
+#
+#  Builds a prior listing of N files and a current listing with PCT% of the files changed (newer, older,
+#  size-changed, deleted, or new), then diffs them with the prior two-pass dict-of-flags code and with
+#  RCloneSync.diffLists.  The two results are checked for identical changed keys and change kinds.
+#
+#==========================================================
+
+import argparse
+import sys
+import os
+import time
+import random
+import collections
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+import RCloneSync
+from RCloneSync import LslEntry, SortedDict, DELTA_NEW, DELTA_NEWER, DELTA_OLDER, DELTA_SIZE, DELTA_DELETED
+
+
+def diffReference (prior, now):
+    # The per-side diff blocks of bidirSync prior to diffLists, without the logging
+    deltas = {}
+    for key in prior:
+        _newer=False; _older=False; _size=False; _deleted=False
+        if key not in now:
+            _deleted=True
+        else:
+            if prior[key].datetime != now[key].datetime:
+                if prior[key].datetime < now[key].datetime:
+                    _newer=True
+                else:
+                    _older=True
+            if prior[key].size != now[key].size:
+                _size=True
+        if _newer or _older or _size or _deleted:
+            deltas[key] = {'new':False, 'newer':_newer, 'older':_older, 'size':_size, 'deleted':_deleted}
+    for key in now:
+        if key not in prior:
+            deltas[key] = {'new':True, 'newer':False, 'older':False, 'size':False, 'deleted':False}
+    deltas = collections.OrderedDict(sorted(deltas.items()))
+    news = newers = olders = deletes = 0
+    for key in deltas:
+        if deltas[key]['new']:      news += 1
+        if deltas[key]['newer']:    newers += 1
+        if deltas[key]['older']:    olders += 1
+        if deltas[key]['deleted']:  deletes += 1
+    return deltas
+
+
+def makeListings (entries, changes, seed):
+    rnd = random.Random(seed)
+    base = time.mktime((2014, 1, 1, 0, 0, 0, 0, 0, -1))
+    prior = {}
+    for n in range(entries):
+        prior["dir{}/sub {}/leaf{}/file {}.jpg".format(n // 100000, (n // 10000) % 10, (n // 100) % 100, n)] = \
+            LslEntry(rnd.randint(0, 50000000), base + rnd.randint(0, 5 * 365 * 86400) + rnd.randint(0, 999) / 1000.0)
+    now = dict(prior)
+    for key in rnd.sample(sorted(prior), entries * changes // 100):
+        kind = rnd.randint(0, 4)
+        if kind == 0:    now[key] = LslEntry(now[key].size, now[key].datetime + 60)
+        elif kind == 1:  now[key] = LslEntry(now[key].size, now[key].datetime - 60)
+        elif kind == 2:  now[key] = LslEntry(now[key].size + 1, now[key].datetime)
+        elif kind == 3:  del now[key]
+        else:            now[key.replace('.jpg', ' new.jpg')] = prior[key]
+    listings = []
+    for d in (prior, now):
+        sd = SortedDict(d)
+        sd.order = sorted(d)
+        listings.append(sd)
+    return listings
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Micro-benchmark for RCloneSync.diffLists")
+    parser.add_argument('--Entries',    help="Number of files in the prior listing (default 1000000)", type=int, default=1000000)
+    parser.add_argument('--Changes',    help="Percent of the files changed (default 1)", type=int, default=1)
+    parser.add_argument('--Seed',       help="Random seed for the synthetic listings", type=int, default=1)
+    args = parser.parse_args()
+
+    prior, now = makeListings (args.Entries, args.Changes, args.Seed)
+    sys.stdout.write("Listings:  {} prior, {} current entries\n".format(len(prior), len(now)))
+
+    start = time.time()
+    reference = diffReference (prior, now)
+    referenceTime = time.time() - start
+    start = time.time()
+    deltas, counts = RCloneSync.diffLists (prior, now)
+    currentTime = time.time() - start
+    sys.stdout.write("  {:10} {:8.2f} s\n  {:10} {:8.2f} s   {} changes\n".format('reference', referenceTime, 'diffLists', currentTime, len(deltas)))
+
+    kinds = (('new', DELTA_NEW), ('newer', DELTA_NEWER), ('older', DELTA_OLDER), ('size', DELTA_SIZE), ('deleted', DELTA_DELETED))
+    identical = list(reference) == list(deltas) and \
+                all(reference[key][name] == bool(deltas[key] & flag) for key in deltas for name, flag in kinds)
+    sys.stdout.write("  Speedup {:.1f}x.  Results {}\n".format(referenceTime / currentTime, "identical" if identical else "DIFFER"))
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+#==========================================================
+#
+#  Micro-benchmark for RCloneSync.loadList on synthetic rclone lsl listings
+#
+#  Usage
+#   python benchmark/bench_loadList.py [--Entries N] [--Seed S]
+#
+#  Generates an lsl format listing, then loads it with the prior regex/strptime/OrderedDict loader and with
+#  the current RCloneSync.loadList.  Each loader runs in its own child process so that peak memory can be
+#  reported.  The two results are checked for identical keys, key order, sizes and datetimes.
+#
+#==========================================================
+
+import argparse
+import sys
+import os
+import re
+import time
+import random
+import resource
+import tempfile
+import subprocess
+import collections
+from datetime import datetime
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+lineFormat = re.compile(r'\s*([0-9]+) ([\d\-]+) ([\d:]+).([\d]+) (.*)')
+
+def loadListReference (infile):
+    # The loadList implementation prior to the fixed-width parser, kept for timing and result comparison
+    d = {}
+    with open(infile, 'r') as f:
+        for line in f:
+            out = lineFormat.match(line)
+            if out:
+                size = out.group(1)
+                date = out.group(2)
+                _time = out.group(3)
+                microsec = out.group(4)
+                date_time = time.mktime(datetime.strptime(date + ' ' + _time, '%Y-%m-%d %H:%M:%S').timetuple()) + float('.'+ microsec)
+                filename = out.group(5)
+                d[filename] = {'size': size, 'datetime': date_time}
+    return collections.OrderedDict(sorted(d.items()))
+
+
+def loadListCurrent (infile):
+    import RCloneSync
+    status, d = RCloneSync.loadList (infile)
+    if status:
+        raise Exception("loadList failed on <{}>".format(infile))
+    return d
+
+
+def makeListing (ofile, entries, seed):
+    # Synthetic tree:  ~100 files per directory, three levels deep, names with spaces, and timestamps
+    # spread over several years with clusters of files sharing the same second (as from a bulk copy)
+    rnd = random.Random(seed)
+    base = time.mktime((2014, 1, 1, 0, 0, 0, 0, 0, -1))
+    with open(ofile, 'w') as of:
+        for n in range(entries):
+            path = "dir{}/sub {}/leaf{}/file {} - {}.jpg".format(n // 100000, (n // 10000) % 10, (n // 100) % 100, n, rnd.randint(0, 9999))
+            if rnd.random() < 0.3:
+                stamp = base + rnd.randint(0, 50) * 86400
+            else:
+                stamp = base + rnd.randint(0, 5 * 365 * 86400)
+            of.write("{:9} {}.{:09} {}\n".format(rnd.randint(0, 50000000), time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(stamp)),
+                                                 rnd.randint(0, 999) * 1000000, path))
+
+
+def child (loader, infile, resultFile):
+    # Load the listing and dump a normalized result (key, size, repr(datetime)) for comparison
+    start = time.time()
+    d = loadListReference (infile) if loader == 'reference' else loadListCurrent (infile)
+    elapsed = time.time() - start
+    with open(resultFile, 'w') as of:
+        for key in d:
+            entry = d[key]
+            if loader == 'reference':
+                of.write("{}\t{}\t{!r}\n".format(key, int(entry['size']), entry['datetime']))
+            else:
+                of.write("{}\t{}\t{!r}\n".format(key, entry.size, entry.datetime))
+    sys.stdout.write("{} {}\n".format(elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Micro-benchmark for RCloneSync.loadList")
+    parser.add_argument('--Entries',    help="Number of files in the synthetic listing (default 200000)", type=int, default=200000)
+    parser.add_argument('--Seed',       help="Random seed for the synthetic listing", type=int, default=1)
+    parser.add_argument('--child',      help=argparse.SUPPRESS, nargs=3)
+    args = parser.parse_args()
+
+    if args.child:
+        child (*args.child)
+        sys.exit(0)
+
+    workDir = tempfile.mkdtemp(prefix='bench_loadList_')
+    listing = os.path.join(workDir, 'listing')
+    makeListing (listing, args.Entries, args.Seed)
+    sys.stdout.write("Listing:  {} entries, {:.1f} MB\n".format(args.Entries, os.path.getsize(listing) / 1e6))
+
+    results = {}
+    for loader in ('reference', 'current'):
+        resultFile = os.path.join(workDir, loader)
+        out = subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', loader, listing, resultFile])
+        elapsed, maxrss = out.split()
+        results[loader] = (float(elapsed), int(maxrss), resultFile)
+        sys.stdout.write("  {:10} {:8.2f} s   peak RSS {:8.1f} MB\n".format(loader, float(elapsed), int(maxrss) / 1024.0))
+
+    with open(results['reference'][2]) as ref, open(results['current'][2]) as cur:
+        identical = ref.read() == cur.read()
+    sys.stdout.write("  Speedup {:.1f}x.  Results {}\n".format(results['reference'][0] / results['current'][0],
+                                                              "identical" if identical else "DIFFER"))
+    for loader in results:
+        os.remove(results[loader][2])
+    os.remove(listing)
+    os.rmdir(workDir)
+    sys.exit(0 if identical else 1)
@@ -0,0 +1,392 @@
+#!/usr/bin/env python
+#==========================================================
+#
+#  Stand-in rclone for the benchmarks:  emulates the rclone commands used by RCloneSync against local directories
+#
+#  Remote paths (Name:some/path) map to $FAKE_RCLONE_ROOT/Name/some/path.  Local paths are used as is.
+#  Supported:  listremotes, backend features, lsl, lsjson -R, hashsum, copy, sync, copyto, moveto, delete, rmdirs, rmdir, with
+#  --exclude-from, --include, --files-from, --filter-from, --max-age, --dry-run, --ignore-times, --leave-root, --files-only
+#  and --dirs-only.  Other options are ignored.  Files are written to a temp name and renamed into place, as rclone does, so
+#  directory modtimes change as with rclone's local backend.
+#
+#  rcd --rc-addr HOST:PORT --rc-user USER --rc-pass PASS (or RCLONE_RC_USER and RCLONE_RC_PASS in the environment, as rclone
+#  takes them) serves the rc API methods used by RCloneSync's --Rcd/--RcdUrl:
+#  rc/noop, config/listremotes, core/bwlimit, job/status, operations/list, fsinfo, copyfile, movefile, deletefile, delete,
+#  rmdirs and rmdir, sync/copy and sync/sync, with _async jobs, _filter and _config.  Each method runs as a call of this
+#  stub, so the emulation and the injected latency and failures are the same as for the commands.
+#
+#  Environment
+#   FAKE_RCLONE_ROOT      Directory holding the remotes (one subdirectory per remote name)
+#   FAKE_RCLONE_LATENCY   Seconds added to each call (default 0)
+#   FAKE_RCLONE_FAIL      Fraction of calls failing before doing anything (default 0)
+#   FAKE_RCLONE_FAIL_STATUS  Exit status of the injected failures (default 5, rclone's temporary error as from rate limiting)
+#   FAKE_RCLONE_LOG       File to append each call's command line to
+#
+#==========================================================
+
+import sys
+import os
+import re
+import time
+import random
+import shutil
+import hashlib
+import json
+import base64
+import itertools
+import threading
+import subprocess
+if sys.version_info[0] >= 3:
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+    from socketserver import ThreadingMixIn
+else:
+    from BaseHTTPServer import BaseHTTPRequestHandler, HTTPServer
+    from SocketServer import ThreadingMixIn
+
+root = os.environ.get('FAKE_RCLONE_ROOT', '/tmp/fake_rclone')
+valueOptions = ('--exclude-from', '--include', '--files-from', '--filter-from', '--max-age', '--bwlimit', '--transfers',
+                '--checkers', '--multi-thread-streams', '--multi-thread-cutoff', '--log-file', '--log-level', '--rc-addr', '--rc-user', '--rc-pass')
+
+
+def globToRegex (glob):
+    # Simplified rclone glob:  leading / anchors to the root, ** spans directories, a trailing / matches a directory's contents
+    if glob.endswith('/'):  glob += '**'
+    anchored = glob.startswith('/')
+    glob = glob.lstrip('/')
+    out = ''; i = 0
+    while i < len(glob):
+        c = glob[i]
+        if glob.startswith('**', i):    out += '.*'; i += 2; continue
+        if c == '*':                    out += '[^/]*'
+        elif c == '?':                  out += '[^/]'
+        elif c == '\\' and i + 1 < len(glob):
+            i += 1; out += re.escape(glob[i])
+        elif c == '{':                  out += '('
+        elif c == '}':                  out += ')'
+        elif c == ',' and '(' in out:   out += '|'
+        elif c == '[':
+            j = glob.index(']', i)
+            out += glob[i:j+1]; i = j
+        else:                           out += re.escape(c)
+        i += 1
+    return re.compile(('^' if anchored else '(^|/)') + out + '$')
+
+
+def readRules (fileName):
+    with open(fileName) as f:
+        return [line.strip() for line in f if line.strip() and line.strip()[0] not in '#;']
+
+
+def fsPath (path):
+    if ':' in path and not path.startswith('/'):
+        name, rest = path.split(':', 1)
+        return os.path.join(root, name, rest.lstrip('/'))
+    return path
+
+
+def walk (base):
+    keys = []
+    for d, dirs, files in os.walk(base):
+        rel = os.path.relpath(d, base)
+        for name in files:
+            keys.append(name if rel == '.' else rel + '/' + name)
+    return sorted(keys)
+
+
+def makeFilter (opts):
+    rules = []                                      # (include, regex), first match wins
+    for fileName in opts.get('--filter-from', []):
+        for line in readRules(fileName):
+            if line[:2] in ('+ ', '- '):  rules.append((line[0] == '+', globToRegex(line[2:])))
+    for fileName in opts.get('--exclude-from', []):
+        rules.extend((False, globToRegex(line)) for line in readRules(fileName))
+    for glob in opts.get('--include', []):
+        rules.append((True, globToRegex(glob)))
+    if opts.get('--include'):
+        rules.append((False, globToRegex('**')))
+    filesFrom = None
+    if '--files-from' in opts:
+        filesFrom = set(line.strip() for fileName in opts['--files-from'] for line in open(fileName) if line.strip() and line[0] not in '#;')
+    maxAge = None
+    if '--max-age' in opts:
+        value = opts['--max-age'][-1]
+        units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+        maxAge = time.time() - (float(value[:-1]) * units[value[-1]] if value[-1] in units else float(value))
+
+    def included (key, fullPath=None):
+        if filesFrom is not None and key not in filesFrom:  return False
+        for include, regex in rules:
+            if regex.search(key):
+                if not include:  return False
+                break
+        if maxAge is not None and fullPath and os.stat(fullPath).st_mtime < maxAge:  return False
+        return True
+    return included
+
+
+def copyFile (src, dest):
+    if not os.path.isdir(os.path.dirname(dest)):
+        os.makedirs(os.path.dirname(dest))
+    shutil.copy2(src, dest + '.partial')
+    os.rename(dest + '.partial', dest)
+
+
+def same (src, dest):
+    if not os.path.exists(dest):  return False
+    s = os.stat(src); d = os.stat(dest)
+    return s.st_size == d.st_size and abs(s.st_mtime - d.st_mtime) < 1e-6
+
+
+rcFilters = {'ExcludeFrom': '--exclude-from', 'IncludeRule': '--include', 'FilesFrom': '--files-from', 'FilterFrom': '--filter-from',
+             'MaxAge': '--max-age'}
+rcFlags = {'DryRun': '--dry-run', 'IgnoreTimes': '--ignore-times', 'NoTraverse': '--no-traverse'}
+rcErrors = {3: 'directory not found', 4: 'object not found', 5: 'rate limit exceeded'}     # rclone exit status -> rc error text
+
+class RcError (Exception):
+    def __init__ (self, message, httpStatus=500):
+        Exception.__init__(self, message)
+        self.httpStatus = httpStatus
+
+def rcJoin (fs, remote):
+    if not remote:  return fs
+    return fs + ('' if fs.endswith((':', '/')) else '/') + remote
+
+def rcCall (method, params):
+    # One rc method, as the stub command line equivalent.  Returns the method's output, or raises RcError.
+    if method == 'rc/noop':             return params
+    if method == 'core/bwlimit':        return {'rate': params.get('rate', 'off')}
+    if method == 'config/listremotes':  return {'remotes': sorted(os.listdir(root))}
+    options = []
+    for name, values in (params.get('_filter') or {}).items():
+        for value in (values if isinstance(values, list) else [values]):
+            options += [rcFilters[name], str(value)]
+    options += [rcFlags[name] for name, value in (params.get('_config') or {}).items() if value and name in rcFlags]
+    if params.get('leaveRoot'):  options.append('--leave-root')
+    if method == 'operations/fsinfo':
+        args = ['backend', 'features', params['fs']]
+    elif method == 'operations/list':
+        opt = params.get('opt') or {}
+        args = ['lsjson', '-R', rcJoin(params['fs'], params.get('remote', ''))] + \
+               (['--files-only'] if opt.get('filesOnly') else []) + (['--dirs-only'] if opt.get('dirsOnly') else [])
+    elif method in ('operations/copyfile', 'operations/movefile'):
+        args = ['copyto' if method == 'operations/copyfile' else 'moveto',
+                rcJoin(params['srcFs'], params['srcRemote']), rcJoin(params['dstFs'], params['dstRemote'])]
+    elif method in ('sync/copy', 'sync/sync'):
+        args = [method.split('/')[1], params['srcFs'], params['dstFs']]
+    elif method == 'operations/deletefile':
+        args = ['delete', rcJoin(params['fs'], params['remote'])]
+    elif method in ('operations/delete', 'operations/rmdirs', 'operations/rmdir'):
+        args = [method.split('/')[1], rcJoin(params['fs'], params.get('remote', ''))]
+    else:
+        raise RcError("couldn't find method \"{}\"".format(method), 404)
+    if sys.version_info[0] < 3:
+        args = [arg.encode('utf-8') if isinstance(arg, unicode) else arg for arg in args + options]
+    else:
+        args = args + options
+    proc = subprocess.Popen([sys.executable, os.path.abspath(__file__)] + args, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    out, err = proc.communicate()
+    if proc.returncode:
+        raise RcError("{}:  {} (exit status {})".format(method, rcErrors.get(proc.returncode, err.decode('utf-8', 'replace').strip()), proc.returncode),
+                      404 if proc.returncode in (3, 4) else 500)
+    if method == 'operations/list':     return {'list': json.loads(out.decode('utf-8'))}
+    if method == 'operations/fsinfo':   return json.loads(out.decode('utf-8'))
+    return {}
+
+def serveRc (addr, user, password):
+    # rclone rcd stand-in:  JSON POSTs to /<method>, HTTP basic auth, keep-alive connections, async jobs run in threads
+    jobs = {}
+    jobIds = itertools.count(1)
+    auth = 'Basic ' + base64.b64encode('{}:{}'.format(user, password).encode('utf-8')).decode('ascii')
+
+    def runJob (jobid, method, params):
+        try:
+            jobs[jobid] = {'id': jobid, 'finished': True, 'success': True, 'error': '', 'output': rcCall(method, params)}
+        except Exception as e:                      # Never left unfinished
+            jobs[jobid] = {'id': jobid, 'finished': True, 'success': False, 'error': str(e), 'output': {}}
+
+    class Handler (BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message (self, *args):
+            pass
+
+        def reply (self, status, result):
+            body = json.dumps(result).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST (self):
+            length = int(self.headers.get('Content-Length') or 0)
+            params = json.loads(self.rfile.read(length).decode('utf-8') or '{}')
+            method = self.path.strip('/')
+            if user and self.headers.get('Authorization') != auth:
+                return self.reply(401, {'error': 'authentication required', 'status': 401})
+            if method == 'job/status':
+                job = jobs.get(params.get('jobid'))
+                if job is None:
+                    return self.reply(404, {'error': 'job not found', 'status': 404})
+                return self.reply(200, job)
+            if params.pop('_async', False):
+                jobid = next(jobIds)
+                jobs[jobid] = {'id': jobid, 'finished': False, 'success': False, 'error': '', 'output': {}}
+                thread = threading.Thread(target=runJob, args=(jobid, method, params))
+                thread.daemon = True
+                thread.start()
+                return self.reply(200, {'jobid': jobid})
+            try:
+                self.reply(200, rcCall(method, params))
+            except Exception as e:
+                status = getattr(e, 'httpStatus', 500)
+                self.reply(status, {'error': str(e), 'status': status, 'path': method})
+
+    class Server (ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    host, port = addr.rsplit(':', 1)
+    Server((host or '127.0.0.1', int(port)), Handler).serve_forever()
+
+
+if __name__ == '__main__':
+    logFile = os.environ.get('FAKE_RCLONE_LOG')
+    if logFile:
+        with open(logFile, 'a') as of:
+            of.write(' '.join(sys.argv[1:]) + '\n')
+    if sys.argv[1:2] == ['rcd']:                    # The server's methods see the latency and failures, as calls of this stub
+        rcOpts = {}
+        rcArgs = sys.argv[2:]
+        while rcArgs:
+            arg = rcArgs.pop(0)
+            if arg in valueOptions and rcArgs:  rcOpts[arg] = rcArgs.pop(0)
+        serveRc (rcOpts.get('--rc-addr', '127.0.0.1:5572'), rcOpts.get('--rc-user', os.environ.get('RCLONE_RC_USER')),
+                 rcOpts.get('--rc-pass', os.environ.get('RCLONE_RC_PASS', '')))
+    time.sleep(float(os.environ.get('FAKE_RCLONE_LATENCY', 0)))
+    if random.random() < float(os.environ.get('FAKE_RCLONE_FAIL', 0)):
+        sys.stderr.write("fake rclone:  injected failure\n")
+        sys.exit(int(os.environ.get('FAKE_RCLONE_FAIL_STATUS', 5)))
+
+    args = sys.argv[1:]
+    cmd = args.pop(0) if args else ''
+    opts = {}; flags = set(); paths = []
+    while args:
+        arg = args.pop(0)
+        if arg in valueOptions and args:    opts.setdefault(arg, []).append(args.pop(0))
+        elif arg.startswith('-'):           flags.add(arg)
+        else:                               paths.append(arg)
+    dryRun = '--dry-run' in flags
+    included = makeFilter(opts)
+
+    if cmd == 'listremotes':
+        for name in sorted(os.listdir(root)):
+            sys.stdout.write(name + ':\n')
+        sys.exit(0)
+
+    if cmd == 'backend':                            # backend features
+        sys.stdout.write(json.dumps({'Name': paths[-1].split(':')[0], 'Features': {'DirModTimeUpdatesOnWrite': True}}) + '\n')
+        sys.exit(0)
+
+    if cmd == 'lsjson':                             # Just -R
+        base = fsPath(paths[0])
+        if not os.path.isdir(base):  sys.exit(3)
+        out = []
+        for d, dirs, files in os.walk(base):
+            rel = os.path.relpath(d, base)
+            for name in sorted(dirs) if '--files-only' not in flags else []:
+                key = name if rel == '.' else rel + '/' + name
+                if not included(key + '/x'):  continue     # Contents excluded
+                mtime = os.stat(os.path.join(d, name)).st_mtime
+                out.append({'Path': key, 'Name': name, 'Size': -1, 'IsDir': True,
+                            'ModTime': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(mtime)) + '.{:06d}Z'.format(int(mtime % 1 * 1e6))})
+            for name in sorted(files) if '--dirs-only' not in flags else []:
+                key = name if rel == '.' else rel + '/' + name
+                if not included(key, os.path.join(d, name)):  continue
+                st = os.stat(os.path.join(d, name))
+                ns = st.st_mtime_ns if hasattr(st, 'st_mtime_ns') else int(st.st_mtime * 1e9)
+                out.append({'Path': key, 'Name': name, 'Size': st.st_size, 'IsDir': False,
+                            'ModTime': time.strftime('%Y-%m-%dT%H:%M:%S', time.gmtime(ns // 1000000000)) + '.{:09}Z'.format(ns % 1000000000)})
+        sys.stdout.write(json.dumps(out) + '\n')
+        sys.exit(0)
+
+    if cmd == 'lsl':
+        base = fsPath(paths[0])
+        if not os.path.isdir(base):  sys.exit(3)
+        out = []
+        for key in walk(base):
+            full = os.path.join(base, key)
+            if not included(key, full):  continue
+            st = os.stat(full)
+            ns = st.st_mtime_ns if hasattr(st, 'st_mtime_ns') else int(st.st_mtime * 1e9)
+            out.append("{:9} {}.{:09} {}\n".format(st.st_size, time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(ns // 1000000000)), ns % 1000000000, key))
+        sys.stdout.write(''.join(out))
+        sys.exit(0)
+
+    if cmd == 'hashsum':
+        hashType, base = paths[0].lower(), fsPath(paths[1])
+        if not os.path.isdir(base):  sys.exit(3)
+        for key in walk(base):
+            full = os.path.join(base, key)
+            if not included(key, full):  continue
+            h = hashlib.new(hashType)
+            with open(full, 'rb') as f:
+                for block in iter(lambda: f.read(1 << 20), b''):
+                    h.update(block)
+            sys.stdout.write("{}  {}\n".format(h.hexdigest(), key))
+        sys.exit(0)
+
+    if cmd in ('copyto', 'moveto'):
+        src, dest = fsPath(paths[0]), fsPath(paths[1])
+        if not os.path.isfile(src):  sys.exit(4)
+        if not dryRun:
+            if cmd == 'copyto':
+                copyFile(src, dest)
+            else:
+                if not os.path.isdir(os.path.dirname(dest)):  os.makedirs(os.path.dirname(dest))
+                os.rename(src, dest)
+        sys.exit(0)
+
+    if cmd in ('copy', 'sync'):
+        src, dest = fsPath(paths[0]), fsPath(paths[1])
+        if '--files-from' in opts and '--no-traverse' in flags:
+            keys = [key for key in sorted(set(line.strip() for f in opts['--files-from'] for line in open(f) if line.strip()))
+                    if os.path.isfile(os.path.join(src, key)) and included(key)]
+        else:
+            keys = [key for key in walk(src) if included(key)]
+        for key in keys:
+            if '--ignore-times' in flags or not same(os.path.join(src, key), os.path.join(dest, key)):
+                if not dryRun:  copyFile(os.path.join(src, key), os.path.join(dest, key))
+        if cmd == 'sync' and os.path.isdir(dest):
+            keep = set(keys)
+            for key in walk(dest):
+                if key not in keep and included(key) and not dryRun:
+                    os.remove(os.path.join(dest, key))
+        sys.exit(0)
+
+    if cmd == 'delete':
+        base = fsPath(paths[0])
+        if os.path.isfile(base):
+            if not dryRun:  os.remove(base)
+            sys.exit(0)
+        if not os.path.isdir(base):  sys.exit(3)
+        keys = walk(base) if '--files-from' not in opts else \
+               [key for key in set(line.strip() for f in opts['--files-from'] for line in open(f) if line.strip()) if os.path.isfile(os.path.join(base, key))]
+        for key in keys:
+            if included(key) and not dryRun:
+                os.remove(os.path.join(base, key))
+        sys.exit(0)
+
+    if cmd in ('rmdirs', 'rmdir'):
+        base = fsPath(paths[0])
+        if not os.path.isdir(base):  sys.exit(3)
+        if cmd == 'rmdir':
+            if os.listdir(base):  sys.exit(1)
+            if not dryRun:  os.rmdir(base)
+            sys.exit(0)
+        for d, dirs, files in os.walk(base, topdown=False):
+            if (d == base and '--leave-root' in flags) or os.listdir(d) or dryRun:  continue
+            os.rmdir(d)
+        sys.exit(0)
+
+    sys.stderr.write("fake rclone:  unsupported command <{}>\n".format(cmd))
+    sys.exit(1)